@@ -11,6 +11,7 @@ Chroma 是一个开源的向量数据库，使用非常简单
 
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils.batch_utils import create_batches
 from typing import List, Dict, Optional, Any
 
 class ChromaVectorDB:
@@ -30,17 +31,24 @@ class ChromaVectorDB:
     - Metadata = 书籍信息（作者、出版日期等）
     """
     
-    def __init__(self, collection_name: str = "default", persist_directory: str = "./chroma_data"):
+    def __init__(self, collection_name: str = "default", persist_directory: str = "./chroma_data",
+                 hnsw_config: Optional[Dict[str, Any]] = None):
         """
         【原理】
         初始化 Chroma 客户端和集合。
+        Chroma 用 HNSW 图索引做近似最近邻搜索，查询复杂度约为 O(log N)，
+        可以通过 hnsw_config 调整索引参数。
         
         【参数说明】
         collection_name: 集合名称（类似数据库的表名）
         persist_directory: 数据持久化目录
+        hnsw_config: HNSW 索引参数（可选），键必须以 "hnsw:" 开头，如
+            {"hnsw:space": "cosine", "hnsw:search_ef": 100, "hnsw:M": 16}
+            只在新建集合时生效；打开已存在的集合时沿用集合原有的索引参数
         
         【示例】
         >>> db = ChromaVectorDB(collection_name="my_docs")
+        >>> db = ChromaVectorDB(collection_name="my_docs", hnsw_config={"hnsw:space": "cosine"})
         """
         # 保存持久化路径
         self._persist_directory = persist_directory
@@ -59,9 +67,16 @@ class ChromaVectorDB:
         
         # 获取或创建集合
         # 集合是 Chroma 中存储向量的基本单位
+        collection_metadata = {"description": "向量数据集合"}
+        if hnsw_config:
+            invalid_keys = [key for key in hnsw_config if not key.startswith("hnsw:")]
+            if invalid_keys:
+                raise ValueError(f"hnsw_config 的键必须以 'hnsw:' 开头: {invalid_keys}")
+            collection_metadata.update(hnsw_config)
+        # 集合已存在时 Chroma 会忽略 metadata，HNSW 参数只在新建时生效
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
-            metadata={"description": "向量数据集合"}
+            metadata=collection_metadata
         )
         
         print(f"✅ 已连接到集合: {collection_name}")
@@ -69,16 +84,20 @@ class ChromaVectorDB:
     
     # ==================== 增加操作 ====================
     
-    def add(self, ids: List[str], documents: List[str], 
+    def add(self, ids: List[str], documents: Optional[List[str]], 
             embeddings: Optional[List[List[float]]] = None,
             metadatas: Optional[List[Dict]] = None) -> bool:
         """
         【原理】
         添加数据到向量数据库。
-        
+        批量数据请一次性传入，不要逐条调用；超过 Chroma 单次上限时会自动分批。
+        注意：分批写入不是原子操作，如果中途某一批失败，之前的批次已经写入，
+        此时返回 False，可以用 db.delete(ids=...) 清理残留数据后重试，
+        或直接用 db.collection.upsert(...) 覆盖写入。
+
         【参数说明】
-        ids: 唯一标识符列表，如 ["doc1", "doc2"]
-        documents: 文本内容列表，如 ["Hello world", "Python编程"]
+        ids: 唯一标识符列表，如 ["doc1", "doc2"]，不能为空
+        documents: 文本内容列表，如 ["Hello world", "Python编程"]（只存向量时可为None）
         embeddings: 向量列表（可选，如果不提供，Chroma会自动计算）
         metadatas: 元数据列表（可选），如 [{"author": "Alice"}]
         
@@ -93,12 +112,23 @@ class ChromaVectorDB:
         ... )
         """
         try:
-            self.collection.add(
+            if not ids:
+                raise ValueError("ids 不能为空")
+            # Chroma 单次写入有上限，超过时按最大批量切片，每片仍是一次整批写入；
+            # 不超过上限时只有一批，仍然只调用一次 collection.add
+            for batch_ids, batch_embeddings, batch_metadatas, batch_documents in create_batches(
+                api=self.client,
                 ids=ids,
-                documents=documents,
                 embeddings=embeddings,  # 如果为None，Chroma会自动使用嵌入模型
-                metadatas=metadatas
-            )
+                metadatas=metadatas,
+                documents=documents
+            ):
+                self.collection.add(
+                    ids=batch_ids,
+                    documents=batch_documents,
+                    embeddings=batch_embeddings,
+                    metadatas=batch_metadatas
+                )
             print(f"✅ 成功添加 {len(ids)} 条数据")
             return True
         except Exception as e:
@@ -125,7 +155,8 @@ class ChromaVectorDB:
     # ==================== 查询操作 ====================
     
     def get(self, ids: Optional[List[str]] = None, 
-            where: Optional[Dict] = None) -> Dict[str, Any]:
+            where: Optional[Dict] = None,
+            include: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         【原理】
         根据ID或条件获取数据。
@@ -133,6 +164,9 @@ class ChromaVectorDB:
         【参数说明】
         ids: 要查询的ID列表
         where: 元数据过滤条件，如 {"type": "article"}
+        include: 需要返回的字段（可选），如 ["metadatas"]；
+            只取需要的字段可以少加载、少传输数据，不传则使用 Chroma 默认字段。
+            没有列在 include 里的字段会返回 None，使用前请先判断
         
         【返回值】
         包含 ids, documents, embeddings, metadatas 的字典
@@ -140,11 +174,13 @@ class ChromaVectorDB:
         【示例】
         >>> result = db.get(ids=["doc1"])
         >>> print(result["documents"])
+        >>> result = db.get(where={"type": "article"}, include=["metadatas"])
         """
         try:
             result = self.collection.get(
                 ids=ids,
-                where=where
+                where=where,
+                **self._include_kwargs(include)
             )
             return result
         except Exception as e:
@@ -154,7 +190,8 @@ class ChromaVectorDB:
     def search(self, query_text: Optional[str] = None,
                query_embedding: Optional[List[float]] = None,
                n_results: int = 3,
-               where: Optional[Dict] = None) -> Dict[str, Any]:
+               where: Optional[Dict] = None,
+               include: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         【原理】
         相似度搜索：找到与查询最相似的数据。
@@ -164,6 +201,8 @@ class ChromaVectorDB:
         query_embedding: 查询向量（如果提供了文本，则不需要）
         n_results: 返回最相似的n个结果
         where: 元数据过滤条件
+        include: 需要返回的字段（可选），如 ["metadatas", "distances"]；
+            没有列在 include 里的字段会返回 None，使用前请先判断
         
         【返回值】
         包含 ids, documents, embeddings, metadatas, distances 的字典
@@ -173,30 +212,76 @@ class ChromaVectorDB:
         >>> for doc, distance in zip(results["documents"][0], results["distances"][0]):
         ...     print(f"{doc}: {distance}")
         """
+        # 单个查询就是只含一条查询的批量查询，共用 search_batch 的逻辑
+        return self.search_batch(
+            query_texts=[query_text] if query_text is not None else None,
+            query_embeddings=[query_embedding] if query_embedding is not None else None,
+            n_results=n_results,
+            where=where,
+            include=include
+        )
+
+    def search_batch(self, query_texts: Optional[List[str]] = None,
+                     query_embeddings: Optional[List[List[float]]] = None,
+                     n_results: int = 3,
+                     where: Optional[Dict] = None,
+                     include: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        【原理】
+        批量相似度搜索：一次调用同时查询多个文本/向量。
+        多个查询合并成一次 collection.query，由 Chroma 在索引内部批量计算，
+        避免在 Python 里逐条循环调用 search。
+
+        【参数说明】
+        query_texts: 查询文本列表
+        query_embeddings: 查询向量列表或二维 numpy 数组（如果提供了文本，则不需要）
+        n_results: 每个查询返回最相似的n个结果
+        where: 元数据过滤条件（对所有查询生效）
+        include: 需要返回的字段（可选），同 search；没有列出的字段会返回 None
+
+        【返回值】
+        与 search 相同结构的字典，但每个字段的第 i 项对应第 i 个查询
+
+        【示例】
+        >>> results = db.search_batch(query_texts=["水果", "蔬菜"], n_results=2)
+        >>> for query_docs in results["documents"]:
+        ...     print(query_docs)
+        """
         try:
-            if query_text:
+            # 用 is not None 和 len 判断，numpy 数组形式的向量也能直接传入，空列表视为未提供
+            if query_texts is not None and len(query_texts) > 0:
                 # 使用文本查询（Chroma自动嵌入）
                 results = self.collection.query(
-                    query_texts=[query_text],
+                    query_texts=query_texts,
                     n_results=n_results,
-                    where=where
+                    where=where,
+                    **self._include_kwargs(include)
                 )
-            elif query_embedding:
+            elif query_embeddings is not None and len(query_embeddings) > 0:
                 # 使用向量查询
                 results = self.collection.query(
-                    query_embeddings=[query_embedding],
+                    query_embeddings=query_embeddings,
                     n_results=n_results,
-                    where=where
+                    where=where,
+                    **self._include_kwargs(include)
                 )
             else:
-                print("❌ 请提供 query_text 或 query_embedding")
+                print("❌ 请提供查询文本或查询向量")
                 return {}
-            
+
             return results
         except Exception as e:
             print(f"❌ 搜索失败: {e}")
             return {}
-    
+
+    @staticmethod
+    def _include_kwargs(include: Optional[List[str]]) -> Dict[str, Any]:
+        """
+        【原理】
+        只有调用方指定了 include 时才传给 Chroma，否则沿用 Chroma 的默认字段。
+        """
+        return {"include": include} if include is not None else {}
+
     # ==================== 更新操作 ====================
     
     def update(self, id: str, document: Optional[str] = None,
@@ -289,8 +374,8 @@ class ChromaVectorDB:
         清空集合中的所有数据。
         """
         try:
-            # 获取所有ID
-            all_data = self.collection.get()
+            # 获取所有ID（include=[] 只取ID，不加载文档和元数据）
+            all_data = self.collection.get(include=[])
             if all_data["ids"]:
                 self.collection.delete(ids=all_data["ids"])
             print("✅ 集合已清空")
@@ -371,6 +456,14 @@ if __name__ == "__main__":
         for doc in results["documents"][0]:
             print(f"  - {doc}")
     
+    # 6.1 批量相似度搜索（一次调用查询多个文本）
+    print("\n【步骤6.1】批量相似度搜索")
+    queries = ["红色的水果", "蔬菜"]
+    results = db.search_batch(query_texts=queries, n_results=2)
+    if results.get("documents"):
+        for query, docs in zip(queries, results["documents"]):
+            print(f"  {query}: {docs}")
+    
     # 7. 更新数据
     print("\n【步骤7】更新数据")
     db.update(